@@ -1,13 +1,49 @@
 import threading
 import os
-from concurrent.futures import ThreadPoolExecutor
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from flask import Flask, render_template, request, jsonify
+from flask.json.provider import DefaultJSONProvider
 from scanner import WordPressScanner
 from plugin_builder import build_list
 from urllib.parse import urlparse, urlunparse 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 app = Flask(__name__)
 
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Makes jsonify/request.json use orjson, scan results can get big."""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    app.json = ORJSONProvider(app)
+
+# one pool for the whole process, so a scan doesn't have to spin up its own threads
+SCAN_EXECUTOR = ThreadPoolExecutor(max_workers=64, thread_name_prefix='scan')
+
+# whole scans run here as jobs; CVE lookups stay on SCAN_EXECUTOR so a job never waits on its own pool
+JOB_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix='scan-job')
+JOBS = {} # job id -> {'future': ..., 'finished_at': ...}
+JOBS_LOCK = threading.Lock()
+JOB_TTL = 3600 # finished results are kept this long (seconds) for the client to pick up
+MAX_PENDING_JOBS = 32 # queued + running scans; past this /scan answers 429 instead of queueing forever
+
+# builds run one at a time on their own worker, two builds would fight over plugin_list.txt
+BUILDER_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix='builder')
+CURRENT_BUILD = {'future': None, 'status': 'idle', 'pages_done': 0, 'pages_total': 0, 'saved': None}
+BUILD_LOCK = threading.Lock()
+
 @app.route('/')
 def index():
     """Serves the main HTML page."""
@@ -15,14 +51,24 @@ def index():
 
 @app.route('/scan', methods=['POST'])
 def start_scan():
-    """Runs the scanner and returns JSON results."""
+    """Queues a scan job and returns its id, poll /scan/<job_id> for the results."""
     data = request.json
     url = data.get('target_url')
     
     scan_level = data.get('scan_level', 1000)
+    # how polite to be with the target, the defaults are fine for most sites
+    max_per_host = data.get('max_per_host', 20)
+    requests_per_second = data.get('requests_per_second')
+    # also ask WPScan about plugins whose version we couldn't detect
+    full_cve_dump = bool(data.get('full_cve_dump', False))
     
     if not url:
         return jsonify({'error': 'No target URL provided'}), 400
+
+    if not isinstance(max_per_host, int) or max_per_host < 1:
+        return jsonify({'error': 'max_per_host must be a positive integer'}), 400
+    if requests_per_second is not None and (not isinstance(requests_per_second, (int, float)) or requests_per_second <= 0):
+        return jsonify({'error': 'requests_per_second must be a positive number'}), 400
     
     if not url.startswith(('http://', 'https://')):
         url = 'https://' + url
@@ -34,42 +80,119 @@ def start_scan():
             parsed_url.netloc, 
             '', '', '', ''
         ))
-    except:
+    except ValueError:
         sanitized_url = url
     
+    job_id = uuid.uuid4().hex
+    with JOBS_LOCK:
+        _prune_jobs()
+        pending = sum(1 for job in JOBS.values() if job['finished_at'] is None)
+        if pending >= MAX_PENDING_JOBS:
+            return jsonify({'error': 'Too many scans in progress, try again later'}), 429
+        future = JOB_EXECUTOR.submit(
+            run_scan, sanitized_url, scan_level, max_per_host, requests_per_second, full_cve_dump
+        )
+        JOBS[job_id] = {'future': future, 'finished_at': None}
+    future.add_done_callback(lambda _: _mark_job_finished(job_id))
+
+    return jsonify({'job_id': job_id}), 202
+
+@app.route('/scan/<job_id>')
+def scan_status(job_id):
+    """Returns {'status': 'running'} until the scan job is done, then its results."""
+    with JOBS_LOCK:
+        job = JOBS.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Unknown or expired scan job'}), 404
+    if not job['future'].done():
+        return jsonify({'status': 'running'})
+    return jsonify({'status': 'done', 'results': job['future'].result()})
+
+def _mark_job_finished(job_id):
+    with JOBS_LOCK:
+        if job_id in JOBS:
+            JOBS[job_id]['finished_at'] = time.monotonic()
+
+def _prune_jobs():
+    """Drops finished jobs nobody picked up within JOB_TTL. Call with JOBS_LOCK held."""
+    now = time.monotonic()
+    expired = [
+        job_id for job_id, job in JOBS.items()
+        if job['finished_at'] is not None and now - job['finished_at'] > JOB_TTL
+    ]
+    for job_id in expired:
+        del JOBS[job_id]
+
+def run_scan(sanitized_url, scan_level, max_per_host, requests_per_second, full_cve_dump):
+    """Runs a full scan on JOB_EXECUTOR and returns the results dict."""
     try:
-        scanner = WordPressScanner(sanitized_url) 
-        results = {}
+        # closing the scanner stops its probe threads once the scan is over
+        with WordPressScanner(
+            sanitized_url,
+            max_per_host=max_per_host,
+            requests_per_second=requests_per_second
+        ) as scanner:
+            results = {}
         
-        results['wp_check'] = scanner.is_wordpress()
+            results['wp_check'] = scanner.is_wordpress()
         
-        if results['wp_check']['is_wordpress']:
+            if results['wp_check']['is_wordpress']:
             
-            plugin_data = scanner.enumerate_plugins(scan_level=scan_level)
+                plugin_data = scanner.enumerate_plugins(scan_level=scan_level)
             
-            results['plugins'] = plugin_data
+                results['plugins'] = plugin_data
             
-            cve_results = []
-            with ThreadPoolExecutor(max_workers=10) as executor: 
+                cve_results = []
                 futures = {
-                    executor.submit(scanner.get_plugin_cves, p['plugin_slug'], p.get('version')): p 
+                    SCAN_EXECUTOR.submit(scanner.get_plugin_cves, p['plugin_slug'], p.get('version'), full_cve_dump): p
                     for p in plugin_data['plugins']
                 }
-                for future in futures:
-                    cve_results.append(future.result())
+                # take each lookup as it finishes instead of waiting on them in order
+                for future in as_completed(futures):
+                    plugin = futures[future]
+                    try:
+                        cve_results.append(future.result())
+                    except Exception as e:
+                        # one bad lookup shouldn't fail the whole scan
+                        cve_results.append({
+                            'plugin_slug': plugin['plugin_slug'],
+                            'version': plugin.get('version'),
+                            'vulnerabilities': [],
+                            'is_outdated': False,
+                            'latest_version': None,
+                            'source': 'N/A',
+                            'error': f'CVE lookup failed: {str(e)}'
+                        })
                     
-            results['vulnerabilities'] = cve_results
+                results['vulnerabilities'] = cve_results
         
-        return jsonify(results)
+        return results
 
     except Exception as e:
-        return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
+        return {'error': f'An unexpected error occurred: {str(e)}'}
 
 @app.route('/builder')
 def builder_page():
     """Serves the new plugin builder HTML page."""
     return render_template('builder.html')
 
+def _update_build(**fields):
+    with BUILD_LOCK:
+        CURRENT_BUILD.update(fields)
+
+def _run_build(sort_by, total_plugins):
+    """Runs on BUILDER_POOL and keeps CURRENT_BUILD up to date for /build-status."""
+    try:
+        saved = build_list(
+            sort_by,
+            total_plugins,
+            on_progress=lambda done, total: _update_build(pages_done=done, pages_total=total)
+        )
+        _update_build(status='done' if saved is not None else 'failed', saved=saved)
+    except Exception:
+        _update_build(status='failed')
+        raise
+
 @app.route('/run-builder', methods=['POST'])
 def run_builder():
     """Runs the plugin builder script in the background."""
@@ -78,12 +201,14 @@ def run_builder():
         sort_by = data.get('sort_by', 'popular')
         total_plugins = data.get('total_plugins', 1000)
         
-        print("Starting background thread for plugin build...")
-        thread = threading.Thread(
-            target=build_list, 
-            args=(sort_by, total_plugins)
-        )
-        thread.start()
+        with BUILD_LOCK:
+            future = CURRENT_BUILD['future']
+            if future is not None and not future.done():
+                return jsonify({'error': 'A plugin list build is already running.'}), 409
+
+            print("Queueing plugin build on the builder worker...")
+            CURRENT_BUILD.update(status='running', pages_done=0, pages_total=0, saved=None)
+            CURRENT_BUILD['future'] = BUILDER_POOL.submit(_run_build, sort_by, total_plugins)
         
         return jsonify({
             'message': 'Plugin list build started! Check your terminal console for progress.'
@@ -92,6 +217,12 @@ def run_builder():
     except Exception as e:
         return jsonify({'error': f'An unexpected error occurred: {str(e)}'}), 500
 
+@app.route('/build-status')
+def build_status():
+    """Reports how far the current (or last) plugin list build got."""
+    with BUILD_LOCK:
+        status = {key: value for key, value in CURRENT_BUILD.items() if key != 'future'}
+    return jsonify(status)
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,7 @@
+# run with: gunicorn -c gunicorn_conf.py app:app
+bind = '0.0.0.0:5000'
+# one process: scan jobs, the builder status and caches live in memory, a second process wouldn't see them
+workers = 1
+worker_class = 'gthread' # scans spend their time waiting on the network, threads are enough
+threads = 64
+timeout = 30 # scans run as background jobs, requests themselves return quickly
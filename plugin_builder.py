@@ -1,14 +1,41 @@
-import requests
-import json
+from scanner import API_SESSION, json_loads
 import math
+import os
+from concurrent.futures import ThreadPoolExecutor
 
 PLUGIN_LIST_FILE = 'plugin_list.txt'
 PER_PAGE = 100 # API max is 100
+MAX_PAGE_WORKERS = 20 # pages are independent, so we fetch this many at once
 
-def build_list(sort_by: str = "popular", total_plugins: int = 1000):
+def fetch_page(page: int, sort_by: str, pages_to_fetch: int):
+    """Fetches one page of plugin slugs. Returns None if the page failed."""
+    try:
+        api_url = (
+            f'https://api.wordpress.org/plugins/info/1.2/?'
+            f'action=query_plugins&request[page]={page}&'
+            f'request[per_page]={PER_PAGE}&request[browse]={sort_by}'
+        )
+        
+        response = API_SESSION.get(api_url, timeout=10)
+        if response.status_code != 200:
+            print(f"Error fetching page {page}, status code: {response.status_code}")
+            return None
+            
+        data = json_loads(response.content)
+        slugs = [plugin['slug'] for plugin in data.get('plugins', [])]
+        print(f"Fetched page {page}/{pages_to_fetch}... found {len(slugs)} slugs.")
+        return slugs
+
+    except Exception as e:
+        print(f"An error occurred on page {page}: {e}")
+        return None
+
+def build_list(sort_by: str = "popular", total_plugins: int = 1000, on_progress=None):
     """
     Fetches the top plugins from the WordPress.org API
     and saves their slugs to a file.
+    on_progress(pages_done, pages_total) is called after every page, if given.
+    Returns how many slugs were saved, or None if nothing was fetched or the file couldn't be written.
     """
     
     pages_to_fetch = math.ceil(total_plugins / PER_PAGE)
@@ -18,45 +45,45 @@ def build_list(sort_by: str = "popular", total_plugins: int = 1000):
     
     all_plugin_slugs = []
     
-    for page in range(1, pages_to_fetch + 1):
-        try:
-            api_url = (
-                f'https://api.wordpress.org/plugins/info/1.2/?'
-                f'action=query_plugins&request[page]={page}&'
-                f'request[per_page]={PER_PAGE}&request[browse]={sort_by}'
-            )
-            
-            response = requests.get(api_url, timeout=10)
-            if response.status_code != 200:
-                print(f"Error fetching page {page}, status code: {response.status_code}")
+    with ThreadPoolExecutor(max_workers=MAX_PAGE_WORKERS) as executor:
+        # map() hands results back in page order, so the list keeps the API's ranking
+        pages = executor.map(
+            lambda page: fetch_page(page, sort_by, pages_to_fetch),
+            range(1, pages_to_fetch + 1)
+        )
+        for page, slugs in enumerate(pages, start=1):
+            if slugs is None:
                 continue
-                
-            data = response.json()
-            plugins = data.get('plugins', [])
-            if not plugins:
+            if not slugs:
                 print(f"No more plugins found at page {page}.")
                 break
-                
-            for plugin in plugins:
-                all_plugin_slugs.append(plugin['slug'])
-                
-            print(f"Fetched page {page}/{pages_to_fetch}... found {len(all_plugin_slugs)} total slugs.")
+            all_plugin_slugs.extend(slugs)
+            if on_progress:
+                on_progress(page, pages_to_fetch)
             
-            # Stop if we have enough plugins
-            if len(all_plugin_slugs) >= total_plugins:
-                break
-
-        except Exception as e:
-            print(f"An error occurred: {e}")
+    print(f"Found {len(all_plugin_slugs)} total slugs.")
             
+    final_list = all_plugin_slugs[:total_plugins]
+    if not final_list:
+        # nothing came back (network down, API errors), keep the list we already have
+        print(f"\nERROR: No plugin slugs fetched, leaving {PLUGIN_LIST_FILE} unchanged")
+        print("--- PLUGIN LIST BUILD FINISHED ---")
+        return None
+
+    saved = None
     try:
-        final_list = all_plugin_slugs[:total_plugins]
-        with open(PLUGIN_LIST_FILE, 'w') as f:
-            for slug in final_list:
-                f.write(f"{slug}\n")
-        print(f"\nSUCCESS: Saved {len(final_list)} plugin slugs to {PLUGIN_LIST_FILE}")
+        # write next to the real file and swap it in, so a scan never reads a half-written list
+        tmp_file = PLUGIN_LIST_FILE + '.tmp'
+        # build the whole file in memory and hand it to the OS in one write
+        with open(tmp_file, 'w') as f:
+            f.write(''.join(f"{slug}\n" for slug in final_list))
+        os.replace(tmp_file, PLUGIN_LIST_FILE)
+        saved = len(final_list)
+        print(f"\nSUCCESS: Saved {saved} plugin slugs to {PLUGIN_LIST_FILE}")
         
     except Exception as e:
         print(f"Error writing to file: {e}")
         
-    print("--- PLUGIN LIST BUILD FINISHED ---")
\ No newline at end of file
+    print("--- PLUGIN LIST BUILD FINISHED ---")
+    return saved
+
@@ -1,59 +1,435 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 import os
-from typing import Optional, Dict, List
-from urllib.parse import urljoin
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional, Dict, List, Set, Tuple
+from urllib.parse import urljoin, urlparse
 import json
-from concurrent.futures import ThreadPoolExecutor
-from distutils.version import LooseVersion
+try:
+    import orjson # optional, parses the API payloads a few times faster
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads # type: ignore[assignment]
+try:
+    import requests_cache # optional, keeps API answers across restarts
+except ImportError:
+    requests_cache = None # type: ignore[assignment]
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from functools import lru_cache
+from packaging.version import Version, InvalidVersion
+
+README_HEAD_BYTES = 2048 # how much of readme.txt we download to find the Stable tag
+HOMEPAGE_MAX_BYTES = 131072 # the WordPress tells are near the top, no need to keep the whole page
+SLUG_SCAN_OVERLAP = 1024 # bytes carried between chunks when scanning the rest of the page for plugins
+PROBE_CONNECT_TIMEOUT = 3 # seconds, connect timeout for HEAD existence probes
+REST_INDEX_HEAD_BYTES = 8192 # start of /wp-json/, enough to see the namespaces list
+
+# compiled once here; every homepage tell in one alternation, so the html is walked only once
+_HOMEPAGE_RE = re.compile(
+    rb'/wp-content/plugins/(?P<plugin>[^/\'"]+)'
+    rb'|/wp-(?:content|includes)/'
+    rb'|(?i:<meta name="generator" content="WordPress (?P<generator>[0-9.]+)")'
+)
+# quick checks while the homepage is still streaming in
+_GENERATOR_RE = re.compile(rb'<meta name="generator" content="WordPress [0-9.]+"', re.IGNORECASE)
+_WP_PATH_RE = re.compile(rb'/wp-(?:content|includes)/')
+# plugin paths only, for the part of the page past the buffered head (footer scripts)
+_PLUGIN_PATH_RE = re.compile(rb'/wp-content/plugins/([^/\'"]+)')
+
+
+def _scan_homepage(html: bytes) -> Dict[str, Any]:
+    """Finds the wp paths, the generator version and the plugin slugs in a single pass."""
+    found: Dict[str, Any] = {'wp_paths': False, 'wp_version': None, 'plugin_slugs': set()}
+    for match in _HOMEPAGE_RE.finditer(html):
+        if match.group('generator'):
+            if not found['wp_version']:
+                found['wp_version'] = match.group('generator').decode('ascii')
+            continue
+        found['wp_paths'] = True
+        if match.group('plugin'):
+            found['plugin_slugs'].add(match.group('plugin').decode('utf-8', 'replace'))
+    return found
+
+
+_VERSION_BYTES = frozenset(b'0123456789.')
+_SPACE_BYTES = frozenset(b' \t\r\n')
+
+
+def _version_after(buf: bytes, label: bytes) -> Optional[str]:
+    """
+    Finds `label` (given in lowercase) in buf, ignoring case, and returns the
+    digits and dots right after it. A plain find + scan, cheaper than a regex per readme.
+    """
+    idx = buf.lower().find(label)
+    if idx < 0:
+        return None
+    start = idx + len(label)
+    end = min(len(buf), start + 64)
+    while start < end and buf[start] in _SPACE_BYTES:
+        start += 1
+    stop = start
+    while stop < end and buf[stop] in _VERSION_BYTES:
+        stop += 1
+    if stop == start:
+        return None
+    return buf[start:stop].decode('ascii')
+
+
+def _has_wp_tells(buf: bytearray) -> bool:
+    """True once the generator tag and a wp-content/wp-includes path are both in buf."""
+    return _GENERATOR_RE.search(buf) is not None and _WP_PATH_RE.search(buf) is not None
+
+
+def _has_wp_v2_namespace(rest_index: bytes) -> bool:
+    """Byte check for "wp/v2" in the /wp-json/ index, no need to parse the JSON for a yes/no."""
+    # PHP's json_encode escapes slashes by default, so WordPress usually sends "wp\/v2"
+    return b'"wp\\/v2"' in rest_index or b'"wp/v2"' in rest_index
+
+
+@lru_cache(maxsize=4096)
+def _parse_version(version: str) -> Version:
+    """Parses a version string once, the same fixed_in values come up again and again."""
+    return Version(version)
+
+
+def _is_older(current: Optional[Version], other: str) -> bool:
+    """True if `current` is below `other`. Anything we can't parse counts as older, to be safe."""
+    if current is None:
+        return True
+    try:
+        return current < _parse_version(other)
+    except InvalidVersion:
+        return True
+
+
+class _TTLCache:
+    """Small thread-safe dict where every entry expires after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # dicts keep insertion order, so this drops the oldest entry
+                self._data.pop(next(iter(self._data)))
+            self._data[key] = (time.monotonic() + self.ttl, value)
+
+
+# the public plugin APIs answer the same for every target, so scans share these
+_WP_INFO_CACHE = _TTLCache(maxsize=10000, ttl=3600)
+_WPSCAN_CACHE = _TTLCache(maxsize=10000, ttl=1800)
+# parsed plugin lists, keyed by path and only reused while the file's mtime and size are unchanged
+_PLUGIN_LIST_CACHE: Dict[str, Tuple[Tuple[int, int], List[str]]] = {}
+_PLUGIN_LIST_LOCK = threading.Lock()
+
+
+def _read_plugin_list(filename: str) -> List[str]:
+    """Reads the slug list in one go, reusing the last parse if the file hasn't changed."""
+    path = os.path.abspath(filename)
+    # ns mtime plus size, a float mtime can miss a replace within the same filesystem tick
+    stat = os.stat(path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _PLUGIN_LIST_LOCK:
+        cached = _PLUGIN_LIST_CACHE.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+    with open(path, 'rb') as f:
+        # one read + one split, split() also drops blank lines and \r
+        plugins = f.read().decode('ascii', 'replace').split()
+    with _PLUGIN_LIST_LOCK:
+        _PLUGIN_LIST_CACHE[path] = (signature, plugins)
+    return plugins
+
+
+class _RateLimiter:
+    """Token bucket, lets through at most `rate` requests per second across all threads."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        # room for at least one token, or a rate below 1/s could never fill it
+        self.capacity = max(1.0, rate)
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+class _PoliteSession(requests.Session):
+    """
+    requests.Session that limits how hard we hit any one host, so a wide scan
+    doesn't trip a WAF or run out of local ports. Every get/head goes through request().
+    """
+
+    def __init__(self, max_per_host: int, requests_per_second: Optional[float] = None):
+        super().__init__()
+        self.max_per_host = max_per_host
+        self.requests_per_second = requests_per_second
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_limiters: Dict[str, _RateLimiter] = {}
+        self._hosts_lock = threading.Lock()
+
+    def _limits_for(self, host: str):
+        with self._hosts_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+                if self.requests_per_second:
+                    self._host_limiters[host] = _RateLimiter(self.requests_per_second)
+            return self._host_slots[host], self._host_limiters.get(host)
+
+    def request(self, method, url, *args, **kwargs):
+        slots, limiter = self._limits_for(urlparse(url).netloc)
+        with slots:
+            if limiter:
+                limiter.acquire()
+            return super().request(method, url, *args, **kwargs)
+
+
+def _make_api_session() -> requests.Session:
+    """
+    Session for the public plugin APIs (wordpress.org, wpscan.com).
+    With requests-cache installed, plugin info and CVE answers are also kept on disk,
+    so a restart doesn't mean asking the APIs about every plugin again.
+    """
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            cache_name='wp_scan_cache',
+            backend='sqlite',
+            expire_after=requests_cache.DO_NOT_CACHE,
+            urls_expire_after={
+                'api.wordpress.org/plugins/info/1.0/*': 3600,
+                'wpscan.com/api/v3/plugins/*': 1800,
+            },
+        )
+    else:
+        session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=64,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504], raise_on_status=False)
+    )
+    session.mount('https://', adapter)
+    return session
+
+
+# shared by every scan in the process, so the TLS connections to the APIs stay open between scans
+API_SESSION = _make_api_session()
+
 
 class WordPressScanner:
     
-    def __init__(self, target_url: str, timeout: int = 10):
+    def __init__(self, target_url: str, timeout: int = 10, max_workers: int = 50,
+                 max_per_host: int = 20, requests_per_second: Optional[float] = None):
         self.target_url = target_url.rstrip('/')
         self.timeout = timeout
-        self.session = requests.Session()
+        # existence probes give up fast on connect, a host that slow won't answer thousands of them anyway
+        self._probe_timeout = (min(PROBE_CONNECT_TIMEOUT, timeout), timeout)
+        # how many probes run at once, the work is all waiting on the network.
+        # every probe goes to the one target host, so threads past max_per_host would only queue on its slots
+        self.max_workers = min(max_workers, max_per_host)
+        self.session = _PoliteSession(max_per_host, requests_per_second)
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/97.0.4692.71 Safari/537.36'
         }) # this part to make the script not look like a bot
-        
+        self.session.headers['Connection'] = 'keep-alive'
+        # pool is as big as the worker count so no thread has to open a new connection.
+        # no retries against the target: a WAF answering 503 + Retry-After would stall every probe,
+        # status retries stay on API_SESSION where get_plugin_cves actually needs them
+        adapter = HTTPAdapter(
+            pool_connections=self.max_workers,
+            pool_maxsize=self.max_workers,
+            max_retries=Retry(total=0, raise_on_status=False)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # start of the homepage, fetched once and shared by is_wordpress and enumerate_plugins
+        self._homepage: Optional[bytearray] = None
+        self._homepage_response: Optional[requests.Response] = None
+        self._homepage_chunks: Optional[Iterator[bytes]] = None
+        # check_plugin results by (target_url, slug), so a slug is never probed twice
+        self._plugin_cache: Dict[tuple, Dict[str, Any]] = {}
+        # one pool for all of this scanner's probes, made on first use
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """Stops the probe threads and closes the target connections."""
+        self._close_homepage()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.session.close()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='probe')
+            return self._executor
     
-    def is_wordpress(self) -> Dict[str, any]:
-        indicators = {
+    def _get_homepage(self, until: Optional[Callable[[bytearray], bool]] = None, refresh: bool = False) -> bytes:
+        """
+        Returns the start of the homepage (about HOMEPAGE_MAX_BYTES), downloading it only once.
+        The body is streamed: if `until(buf)` returns True reading pauses there, and the
+        next call carries on where it stopped. Redirects are followed and target_url moves to
+        where we ended up.
+        """
+        if refresh:
+            self._close_homepage()
+            self._homepage = None
+        if self._homepage is None:
+            response = self.session.get(self.target_url, timeout=self.timeout, allow_redirects=True, stream=True)
+            self.target_url = response.url.rstrip('/')
+            self._homepage = bytearray()
+            self._homepage_response = response
+            self._homepage_chunks = response.iter_content(chunk_size=16384)
+
+        buf = self._homepage
+        if until and until(buf):
+            return bytes(buf)
+        while len(buf) < HOMEPAGE_MAX_BYTES:
+            chunk = self._next_homepage_chunk()
+            if chunk is None:
+                break
+            buf.extend(chunk)
+            if until and until(buf):
+                break
+        return bytes(buf)
+
+    def _next_homepage_chunk(self) -> Optional[bytes]:
+        """Next piece of the streamed homepage, None once it's over (or the connection broke)."""
+        if self._homepage_chunks is None:
+            return None
+        try:
+            chunk = next(self._homepage_chunks, None)
+        except requests.RequestException:
+            chunk = None # keep whatever we got before the connection broke
+        if chunk is None:
+            self._close_homepage()
+        return chunk
+
+    def _homepage_plugin_slugs(self) -> Set[str]:
+        """
+        Plugin slugs referenced anywhere on the homepage. Past the buffered head the page
+        is scanned chunk by chunk with a small overlap, so footer scripts are still seen
+        without holding the whole page in memory.
+        """
+        slugs = set()
+        window = self._get_homepage()
+        while True:
+            chunk = self._next_homepage_chunk()
+            for match in _PLUGIN_PATH_RE.finditer(window):
+                # a match running into the end of the window may be a slug cut in half, the next window has it whole
+                if chunk is None or match.end() < len(window):
+                    slugs.add(match.group(1).decode('utf-8', 'replace'))
+            if chunk is None:
+                return slugs
+            window = window[-SLUG_SCAN_OVERLAP:] + chunk
+
+    def _close_homepage(self):
+        if self._homepage_response is not None:
+            self._homepage_response.close()
+        self._homepage_response = None
+        self._homepage_chunks = None
+
+    def is_wordpress(self) -> Dict[str, Any]:
+        indicators: Dict[str, Any] = {
             'is_wordpress': False,
             'confidence': 0,
             'detected_by': [],
             'wp_version': None,
             'url': self.target_url
         }
+        # the REST probe doesn't need the homepage, so it goes out at the same time
+        api_url = urljoin(self.target_url, '/wp-json/')
+        api_future = self._get_executor().submit(self._probe_rest_api, api_url)
         try:
-            response = self.session.get(self.target_url, timeout=self.timeout, allow_redirects=True)
-            self.target_url = response.url.rstrip('/')
-            html = response.text
-            if '/wp-content/' in html or '/wp-includes/' in html:
+            # stop downloading once both tells are in, enumerate_plugins reads the rest later
+            page = _scan_homepage(self._get_homepage(until=_has_wp_tells))
+            if page['wp_paths']:
                 indicators['detected_by'].append('wp-content/wp-includes paths')
                 indicators['confidence'] += 30
-            generator_match = re.search(r'<meta name="generator" content="WordPress ([0-9.]+)"', html, re.IGNORECASE)
-            if generator_match:
+            if page['wp_version']:
                 indicators['detected_by'].append('meta generator tag')
-                indicators['wp_version'] = generator_match.group(1)
+                indicators['wp_version'] = page['wp_version']
                 indicators['confidence'] += 40
-            try:
-                api_url = urljoin(self.target_url, '/wp-json/')
-                api_response = self.session.get(api_url, timeout=self.timeout)
-                if api_response.status_code == 200 and 'namespaces' in api_response.text:
-                    indicators['detected_by'].append('REST API endpoint')
-                    indicators['confidence'] += 30
-            except:
-                pass
+            if indicators['confidence'] >= 30:
+                # the homepage already settled it, don't wait on the REST probe
+                api_future.cancel()
+            else:
+                final_api_url = urljoin(self.target_url, '/wp-json/')
+                if final_api_url != api_url:
+                    # the homepage redirected to another origin (www, https), ask the REST API there instead
+                    api_future.cancel()
+                    api_future = self._get_executor().submit(self._probe_rest_api, final_api_url)
+                try:
+                    api_head = api_future.result()
+                    if api_head is not None and _has_wp_v2_namespace(api_head):
+                        indicators['detected_by'].append('REST API endpoint')
+                        indicators['confidence'] += 30
+                except requests.RequestException:
+                    pass
             if indicators['confidence'] >= 30:
                 indicators['is_wordpress'] = True
         except requests.RequestException as e:
             indicators['error'] = str(e)
         return indicators
     
-    def check_plugin(self, plugin_slug: str) -> Dict[str, any]:
-        result = {
+    def _probe_rest_api(self, api_url: str) -> Optional[bytes]:
+        """Returns the start of the /wp-json/ index, or None if it isn't there."""
+        response = self.session.get(api_url, timeout=self.timeout, stream=True)
+        if response.status_code != 200:
+            response.close()
+            return None
+        # "namespaces" is one of the first keys, the route list after it can be huge
+        return self._read_limited(response, REST_INDEX_HEAD_BYTES)
+
+    def check_plugin(self, plugin_slug: str) -> Dict[str, Any]:
+        """Checks one plugin slug, each (target, slug) pair is only probed once per scanner."""
+        key = (self.target_url, plugin_slug)
+        cached = self._plugin_cache.get(key)
+        if cached is not None:
+            return cached
+        result = self._probe_plugin(plugin_slug)
+        self._plugin_cache[key] = result
+        return result
+
+    def _probe_plugin(self, plugin_slug: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
             'plugin_slug': plugin_slug,
             'is_installed': False,
             'version': None,
@@ -63,20 +439,19 @@ class WordPressScanner:
         plugin_base_url = f'{self.target_url}/wp-content/plugins/{plugin_slug}/'
         readme_url = urljoin(plugin_base_url, 'readme.txt')
         try:
-            readme_response = self.session.get(readme_url, timeout=self.timeout)
+            # HEAD first so a missing plugin costs only the headers
+            readme_response = self.session.head(readme_url, timeout=self._probe_timeout, allow_redirects=False)
             if readme_response.status_code == 200:
                 result['is_installed'] = True
                 result['detected_by'] = 'readme.txt'
                 result['plugin_url'] = readme_url
-                version_match = re.search(r'Stable tag:\s*([0-9.]+)', readme_response.text, re.IGNORECASE)
-                if version_match:
-                    result['version'] = version_match.group(1)
+                result['version'] = self._read_stable_tag(readme_url)
                 return result
         except requests.RequestException:
             pass
         try:
             css_url = urljoin(plugin_base_url, f'assets/css/{plugin_slug}.css') 
-            file_response = self.session.head(css_url, timeout=self.timeout)
+            file_response = self.session.head(css_url, timeout=self._probe_timeout, allow_redirects=False)
             if file_response.status_code == 200:
                 result['is_installed'] = True
                 result['detected_by'] = 'asset file'
@@ -85,12 +460,42 @@ class WordPressScanner:
             pass
         return result
 
-    def get_plugin_cves(self, plugin_slug: str, version: Optional[str] = None) -> Dict[str, any]:
+    @staticmethod
+    def _read_limited(response: requests.Response, limit: int) -> bytes:
+        """Reads at most `limit` bytes of a streamed response and releases the connection."""
+        buf = bytearray()
+        try:
+            for chunk in response.iter_content(chunk_size=min(limit, 8192)):
+                buf.extend(chunk)
+                if len(buf) >= limit:
+                    break
+        finally:
+            response.close()
+        return bytes(buf[:limit])
+
+    def _read_stable_tag(self, readme_url: str) -> Optional[str]:
+        """Reads only the top of readme.txt, the Stable tag is always in the header block."""
+        try:
+            response = self.session.get(
+                readme_url,
+                headers={'Range': f'bytes=0-{README_HEAD_BYTES - 1}'},
+                stream=True,
+                timeout=self.timeout
+            )
+            # servers that ignore Range still send 200, so cap the read ourselves
+            head = self._read_limited(response, README_HEAD_BYTES)
+        except requests.RequestException:
+            return None
+        return _version_after(head, b'stable tag:')
+
+    def get_plugin_cves(self, plugin_slug: str, version: Optional[str] = None,
+                        full_cve_dump: bool = False) -> Dict[str, Any]:
         """
         Task 003: Get CVE info.
         NEW LOGIC: Checks free API first. Only uses paid API if plugin is outdated.
+        Without a known version the paid API is skipped, unless full_cve_dump is set.
         """
-        result = {
+        result: Dict[str, Any] = {
             'plugin_slug': plugin_slug,
             'version': version,
             'vulnerabilities': [],
@@ -99,45 +504,66 @@ class WordPressScanner:
             'source': 'N/A'
         }
         api_token = os.environ.get('WPSCAN_API_TOKEN') 
+        # parse the installed version once, it's compared against every fixed_in below
+        try:
+            current_version = _parse_version(version) if version else None
+        except InvalidVersion:
+            current_version = None
 
         # --- Step 1: Check free API first to see if plugin is outdated ---
         result['source'] = 'WordPress.org API'
+        wp_org_answered = False
         try:
-            wp_api_url = f'https://api.wordpress.org/plugins/info/1.0/{plugin_slug}.json'
-            wp_response = self.session.get(wp_api_url, timeout=self.timeout)
-            
-            if wp_response.status_code == 200:
-                plugin_data = wp_response.json()
-                result['latest_version'] = plugin_data.get('version')
+            wp_info = _WP_INFO_CACHE.get(plugin_slug)
+            if wp_info is None:
+                wp_api_url = f'https://api.wordpress.org/plugins/info/1.0/{plugin_slug}.json'
+                wp_response = API_SESSION.get(wp_api_url, timeout=self.timeout)
+                wp_info = {'status_code': wp_response.status_code, 'latest_version': None}
+                if wp_response.status_code == 200:
+                    wp_info['latest_version'] = json_loads(wp_response.content).get('version')
+                if wp_response.status_code in (200, 404):
+                    # don't remember server errors, the next scan should try again
+                    _WP_INFO_CACHE.set(plugin_slug, wp_info)
+
+            wp_org_answered = True
+            if wp_info['status_code'] == 200:
+                result['latest_version'] = wp_info['latest_version']
                 if version and result['latest_version']:
-                    result['is_outdated'] = LooseVersion(version) < LooseVersion(result['latest_version'])
+                    result['is_outdated'] = _is_older(current_version, result['latest_version'])
             else:
                 # If this API fails, we must assume it's outdated to be safe too
                 result['is_outdated'] = True 
+        except (requests.ConnectionError, requests.Timeout) as e:
+            # just a network blip (already retried by the adapter), not a reason to pay for a WPScan call
+            result['error'] = f"WordPress.org API unreachable: {str(e)}"
+            result['source'] = 'WordPress.org API (unreachable)'
         except Exception:
-            # any error assume it's outdated to trigger the CVE scan
+            # any other error (bad answer) assume it's outdated to trigger the CVE scan
             result['is_outdated'] = True
-            pass 
 
         # --- Step 2: If it's outdated (or we couldn't check) AND we have a token, get CVEs ---
         # the (not result['latest_version'] and version) part handles plugins not on wordpress.org
-        is_unknown = (not result['latest_version'] and version)
+        is_unknown = (wp_org_answered and not result['latest_version'] and version)
+        # with no version we can't filter the CVEs, so only ask when the caller wants everything
+        worth_asking = bool(version) or full_cve_dump
         
-        if (result['is_outdated'] or is_unknown) and api_token:
+        if (result['is_outdated'] or is_unknown) and worth_asking and api_token:
             result['source'] = 'WPScan API (Outdated)'
             api_url = f'https://wpscan.com/api/v3/plugins/{plugin_slug}'
             headers = {'Authorization': f'Token token={api_token}'}
             try:
-                api_response = self.session.get(api_url, headers=headers, timeout=self.timeout)
-                if api_response.status_code == 200:
-                    data = api_response.json()
-                    plugin_data = data.get(plugin_slug, {})
-                    
+                plugin_data = _WPSCAN_CACHE.get(plugin_slug)
+                if plugin_data is None:
+                    api_response = API_SESSION.get(api_url, headers=headers, timeout=self.timeout)
+                    if api_response.status_code == 200:
+                        plugin_data = json_loads(api_response.content).get(plugin_slug, {})
+                        _WPSCAN_CACHE.set(plugin_slug, plugin_data)
+                if plugin_data is not None:
                     # We trust the WPScan latest_version more, so update it..
                     if plugin_data.get('latest_version'):
                         result['latest_version'] = plugin_data.get('latest_version')
                         if version and result['latest_version']:
-                            result['is_outdated'] = LooseVersion(version) < LooseVersion(result['latest_version'])
+                            result['is_outdated'] = _is_older(current_version, result['latest_version'])
 
                     # --- IMPROVEMENT: Only show relevant CVEs ---
                     for vuln in plugin_data.get('vulnerabilities', []):
@@ -150,27 +576,19 @@ class WordPressScanner:
                                 'cve': vuln.get('cve'),
                                 'fixed_in': 'Not fixed'
                             })
-                        elif version:
-                            try:
-                                # show only if less than fixed version
-                                if LooseVersion(version) < LooseVersion(fixed_in_version):
-                                    result['vulnerabilities'].append({
-                                        'title': vuln.get('title'),
-                                        'cve': vuln.get('cve'),
-                                        'fixed_in': fixed_in_version
-                                    })
-                            except:
-
-                                result['vulnerabilities'].append({
-                                        'title': vuln.get('title'),
-                                        'cve': vuln.get('cve'),
-                                        'fixed_in': fixed_in_version
-                                    })
+                        elif version and _is_older(current_version, fixed_in_version):
+                            # show only if less than fixed version (or we can't tell)
+                            result['vulnerabilities'].append({
+                                'title': vuln.get('title'),
+                                'cve': vuln.get('cve'),
+                                'fixed_in': fixed_in_version
+                            })
             except Exception as e:
                 result['error'] = f"WPScan API error: {str(e)}"
         
         # the plugin was up-to-date AND we have a token, we skipped the CVE scan.
-        if not result['is_outdated'] and api_token:
+        # only say so if WordPress.org actually answered, otherwise we never checked
+        if not result['is_outdated'] and api_token and wp_org_answered:
             result['source'] = 'WordPress.org API (Up to date)'
 
         return result
@@ -189,12 +607,11 @@ class WordPressScanner:
             return default_list
         
         try:
-            with open(filename, 'r') as f:
-                plugins = [line.strip() for line in f if line.strip()]
+            plugins = _read_plugin_list(filename)
             if scan_level == -1:
                 # User selected "Full List"
                 print(f"--- Loaded {len(plugins)} (All) plugins from {filename} ---")
-                return plugins
+                return list(plugins) # copy, the parsed list is shared between scans
             else:
                 # Slice the list to the selected amount
                 limited_plugins = plugins[:scan_level]
@@ -208,31 +625,68 @@ class WordPressScanner:
 
 
 
-    def enumerate_plugins(self, scan_level: int = 1000) -> Dict[str, any]:
+    def _list_plugins_from_rest(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Asks /wp-json/wp/v2/plugins for the installed plugins. This normally needs a login,
+        so None (not exposed, or no usable entries) is the usual answer. _fields keeps the reply small.
+        """
+        api_url = urljoin(self.target_url, '/wp-json/wp/v2/plugins')
+        try:
+            response = self.session.get(
+                api_url,
+                params={'_fields': 'plugin,name,version,status'},
+                timeout=self.timeout
+            )
+            if response.status_code != 200:
+                return None
+            plugins_data = json_loads(response.content)
+        except (requests.RequestException, ValueError):
+            return None
+        if not isinstance(plugins_data, list):
+            return None
+
+        plugins = []
+        for plugin in plugins_data:
+            # this JSON comes from the target, so don't trust the types
+            if not isinstance(plugin, dict) or not isinstance(plugin.get('plugin'), str) or not plugin['plugin']:
+                continue
+            version = plugin.get('version')
+            # "plugin" looks like "akismet/akismet", the folder is the slug
+            plugins.append({
+                'plugin_slug': plugin['plugin'].split('/')[0],
+                'is_installed': True,
+                'version': version if isinstance(version, str) else None,
+                'detected_by': 'REST API',
+                'plugin_url': api_url
+            })
+        # an empty or unusable list (catch-all pages, security plugins) proves nothing, scan normally
+        return plugins or None
+
+    def enumerate_plugins(self, scan_level: int = 1000) -> Dict[str, Any]:
         """Task 004: Enumerate all installed WordPress plugins."""
         
-        result = {
+        result: Dict[str, Any] = {
             'plugins': [],
             'total_found': 0,
             'detection_methods': []
         }
-        found_slugs = set()
+        # installed plugins by slug, one entry per plugin however it was found
+        plugins_by_slug: Dict[str, Dict[str, Any]] = {}
+        slugs_from_html = set()
+
+        # a site that exposes /wp/v2/plugins gives us the authoritative list, no brute force needed
+        rest_plugins = self._list_plugins_from_rest()
+        if rest_plugins is not None:
+            result['detection_methods'].append('REST API plugins endpoint')
+            result['plugins'] = rest_plugins
+            result['total_found'] = len(rest_plugins)
+            return result
         
         try:
-            response = self.session.get(self.target_url, timeout=self.timeout)
-            html = response.text
-            plugin_pattern = r'/wp-content/plugins/([^/\'"]+)'
-            slugs_from_html = set(re.findall(plugin_pattern, html))
-            
+            slugs_from_html = self._homepage_plugin_slugs()
             if slugs_from_html:
                 result['detection_methods'].append('HTML parsing')
-                for slug in slugs_from_html:
-                    if slug not in found_slugs:
-                        plugin_info = self.check_plugin(slug)
-                        if plugin_info['is_installed']:
-                            result['plugins'].append(plugin_info)
-                            found_slugs.add(slug)
-        except:
+        except requests.RequestException:
             pass
         
         # --- 3. PASS THE VALUE HERE ---
@@ -240,15 +694,24 @@ class WordPressScanner:
         
         result['detection_methods'].append('common plugin checking (concurrent)')
         
-        plugins_to_check = [slug for slug in common_plugins if slug not in found_slugs]
+        # html slugs and the common list go out as one batch, each slug only once
+        # (dict.fromkeys keeps the order and also drops repeats inside plugin_list.txt)
+        plugins_to_check = list(dict.fromkeys([*slugs_from_html, *common_plugins]))
         
-        with ThreadPoolExecutor(max_workers=20) as executor: 
-            futures = [executor.submit(self.check_plugin, slug) for slug in plugins_to_check]
-            for future in futures:
+        executor = self._get_executor()
+        # keep only a couple of waves queued, a full list scan would otherwise create 10k+ futures up front
+        slugs = iter(plugins_to_check)
+        pending = {executor.submit(self.check_plugin, slug) for slug in islice(slugs, self.max_workers * 2)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
                 plugin_info = future.result()
                 if plugin_info['is_installed']:
-                    result['plugins'].append(plugin_info)
-                    found_slugs.add(plugin_info['plugin_slug'])
+                    plugins_by_slug.setdefault(plugin_info['plugin_slug'], plugin_info)
+                next_slug = next(slugs, None)
+                if next_slug is not None:
+                    pending.add(executor.submit(self.check_plugin, next_slug))
                     
+        result['plugins'] = list(plugins_by_slug.values())
         result['total_found'] = len(result['plugins'])
         return result
\ No newline at end of file